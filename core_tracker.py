@@ -1,9 +1,14 @@
 import re
+import threading
 import traceback
 import time
 from datetime import datetime, timedelta, date 
 from typing import List, Dict, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
 from selenium import webdriver
@@ -12,7 +17,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, insert
 
 from db_models import Playlist, Track, StreamHistory
 
@@ -20,11 +25,49 @@ from db_models import Playlist, Track, StreamHistory
 CLIENT_ID = "a2960e69a9ec414bb708bf002b224b25"
 CLIENT_SECRET = "9622dfa07b3745de8b60de42775bd356"
 
+# Process-wide Spotipy client, built on first use. Client-credentials auth
+# costs a token fetch + TLS handshake, so callers that just need one API
+# call (e.g. resolving a playlist name) share this instead of constructing
+# a tracker.
+_spotify_client = None
+
+# Caps concurrent Spotify Web API calls across tracker threads so a
+# parallel run doesn't trip the 429 rate limit
+_spotify_api_limit = threading.Semaphore(4)
+
+def _build_http_session():
+    """Pooled keep-alive session with retry/backoff for Spotify API calls."""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+    ))
+    return session
+
+def get_spotify_client():
+    """Return the shared authenticated Spotipy client (lazy singleton)."""
+    global _spotify_client
+    if _spotify_client is None:
+        auth_manager = SpotifyClientCredentials(
+            client_id=CLIENT_ID,
+            client_secret=CLIENT_SECRET
+        )
+        _spotify_client = spotipy.Spotify(
+            auth_manager=auth_manager,
+            requests_session=_build_http_session()
+        )
+    return _spotify_client
+
 class SpotifyStreamTracker:
-    def __init__(self, playlist_url: str):
+    def __init__(self, playlist_url: str, sp: Optional[spotipy.Spotify] = None):
         self.playlist_url = playlist_url
         self.playlist_id = self._parse_playlist_id(playlist_url)
-        self.sp = None
+        self.sp = sp
         self.driver = None
         self.tracks_data = []
 
@@ -33,12 +76,12 @@ class SpotifyStreamTracker:
         return match.group(1) if match else None
 
     def setup_spotipy(self):
+        # All trackers share one client (and its keep-alive session), so
+        # auth and TLS handshakes happen once per process, not per playlist
+        if self.sp is not None:
+            return True
         try:
-            auth_manager = SpotifyClientCredentials(
-                client_id=CLIENT_ID, 
-                client_secret=CLIENT_SECRET
-            )
-            self.sp = spotipy.Spotify(auth_manager=auth_manager)
+            self.sp = get_spotify_client()
             print("✓ Spotify API authenticated")
             return True
         except Exception as e:
@@ -82,12 +125,13 @@ class SpotifyStreamTracker:
         print(f"Fetching API data for playlist {self.playlist_id}...")
         tracks = []
         try:
-            results = self.sp.playlist_items(self.playlist_id, limit=100)
-            items = results['items']
-            
-            while results['next']:
-                results = self.sp.next(results)
-                items.extend(results['items'])
+            with _spotify_api_limit:
+                results = self.sp.playlist_items(self.playlist_id, limit=100)
+                items = results['items']
+
+                while results['next']:
+                    results = self.sp.next(results)
+                    items.extend(results['items'])
             
             for item in items:
                 track = item.get('track')
@@ -303,7 +347,13 @@ class SpotifyStreamTracker:
 
             today_date = date.today()
             processed_count = 0
-            
+
+            # History rows are collected as dicts and written in one
+            # executemany INSERT at the end — one commit per playlist
+            # instead of one per track
+            history_rows = []
+            seen_track_ids = set()
+
             for idx, t_data in enumerate(api_tracks, 1):
                 # 1. FIX: Look for the song SPECIFICALLY in this playlist (Separate duplicate songs)
                 db_track = db.query(Track).filter(
@@ -322,10 +372,16 @@ class SpotifyStreamTracker:
                         playlist_id=playlist_obj.id
                     )
                     db.add(db_track)
-                    db.commit()
-                    db.refresh(db_track)
+                    db.flush()  # assigns the id without a per-track commit
                     print(f"  → New track added to database")
 
+                # 2. FIX: Same song listed twice in one playlist — only the
+                # first occurrence gets a history row (pending rows aren't
+                # visible to the existing_today query below)
+                if db_track.id in seen_track_ids:
+                    continue
+                seen_track_ids.add(db_track.id)
+
                 existing_today = db.query(StreamHistory).filter(
                     and_(
                         StreamHistory.track_id == db_track.id,
@@ -378,19 +434,18 @@ class SpotifyStreamTracker:
                             for i in range(1, days_gap):
                                 missing_date = last_entry.date + timedelta(days=i)
                                 imputed_total = last_entry.total_streams + (daily_average * i)
-                                missing_history = StreamHistory(
-                                    date=missing_date,
-                                    track_id=db_track.id,
-                                    total_streams=imputed_total,
-                                    daily_streams=daily_average,
-                                    weekly_streams=0, 
-                                    monthly_streams=0,
-                                    is_imputed=True,
-                                    is_new=False,
-                                    is_reset=False,
-                                    is_hidden=False
-                                )
-                                db.add(missing_history)
+                                history_rows.append({
+                                    "date": missing_date,
+                                    "track_id": db_track.id,
+                                    "total_streams": imputed_total,
+                                    "daily_streams": daily_average,
+                                    "weekly_streams": 0,
+                                    "monthly_streams": 0,
+                                    "is_imputed": True,
+                                    "is_new": False,
+                                    "is_reset": False,
+                                    "is_hidden": False
+                                })
                     
                     elif total_streams < last_entry.total_streams:
                         is_reset = True
@@ -405,23 +460,24 @@ class SpotifyStreamTracker:
                     db, db_track.id, daily_diff, today_date
                 )
 
-                new_history = StreamHistory(
-                    date=today_date,
-                    track_id=db_track.id,
-                    total_streams=total_streams,
-                    daily_streams=daily_diff,
-                    weekly_streams=weekly_sum,
-                    monthly_streams=monthly_sum,
-                    is_new=is_new,
-                    is_reset=is_reset,
-                    is_imputed=is_imputed,
-                    is_hidden=is_hidden
-                )
-                db.add(new_history)
+                history_rows.append({
+                    "date": today_date,
+                    "track_id": db_track.id,
+                    "total_streams": total_streams,
+                    "daily_streams": daily_diff,
+                    "weekly_streams": weekly_sum,
+                    "monthly_streams": monthly_sum,
+                    "is_new": is_new,
+                    "is_reset": is_reset,
+                    "is_imputed": is_imputed,
+                    "is_hidden": is_hidden
+                })
                 processed_count += 1
-                
-                # 2. FIX: Save immediately to prevent duplicate "New" entries in same playlist
-                db.commit()
+
+            # One batched INSERT for the whole playlist (the engine pages
+            # it into multi-row statements on Postgres), then one commit
+            if history_rows:
+                db.execute(insert(StreamHistory), history_rows)
 
             playlist_obj.last_updated = datetime.utcnow()
             db.commit()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
 
@@ -45,7 +45,7 @@ class Track(Base):
     artist = Column(String, nullable=False)
     url = Column(String)
     
-    playlist_id = Column(Integer, ForeignKey("playlists.id"))
+    playlist_id = Column(Integer, ForeignKey("playlists.id"), index=True)
     playlist = relationship("Playlist", back_populates="tracks")
     
     stream_history = relationship("StreamHistory", back_populates="track", cascade="all, delete-orphan")
@@ -55,6 +55,21 @@ class StreamHistory(Base):
     Daily snapshots of stream counts with all data rules implemented.
     """
     __tablename__ = "stream_history"
+    # Composite indexes for the two hot access paths: the dashboards filter
+    # on date then join by track, and track history filters on track then
+    # orders by date
+    # The INCLUDE columns let Postgres answer the dashboard aggregates with
+    # an index-only scan; other dialects simply ignore the option
+    __table_args__ = (
+        Index(
+            "ix_stream_history_date_track", "date", "track_id",
+            postgresql_include=[
+                "total_streams", "daily_streams", "weekly_streams",
+                "monthly_streams", "is_simulated"
+            ]
+        ),
+        Index("ix_stream_history_track_date", "track_id", "date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     date = Column(Date, nullable=False, index=True)
     
@@ -74,6 +89,12 @@ class StreamHistory(Base):
     is_reset = Column(Boolean, default=False)    # Streams decreased (reset)
     is_new = Column(Boolean, default=False)      # First appearance
     is_hidden = Column(Boolean, default=False)   # Stream count not visible
+    is_simulated = Column(Boolean, default=False, nullable=False)  # Count estimated, not scraped
+
+    # How the count was obtained ('api', 'scrape', ...) and how much we
+    # trust it (0.0-1.0); both optional for rows written before tracking
+    scrape_method = Column(String, nullable=True)
+    confidence_score = Column(Float, nullable=True)
 
 class UpdateLog(Base):
     """
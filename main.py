@@ -1,816 +1,1261 @@
-import os
-import time
-import secrets
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from datetime import datetime, timedelta, date
-from typing import List, Optional
-import re
-
-from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.responses import HTMLResponse
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi.staticfiles import StaticFiles
-from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import sessionmaker, Session
-from passlib.context import CryptContext
-from jose import JWTError, jwt
-from pydantic import BaseModel
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-
-from db_models import Base, User, Playlist, Track, StreamHistory, UpdateLog
-
-# Configuration
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./stream_tracker.db")
-SECRET_KEY = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
-
-# Email Configuration
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
-SENDER_EMAIL = os.getenv("SENDER_EMAIL", "")
-SENDER_PASSWORD = os.getenv("SENDER_PASSWORD", "")
-RECIPIENT_EMAIL = "andre@sevenstudios.se"
-
-# Database Setup
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
-# Pydantic Models
-class Token(BaseModel):
-    access_token: str
-    token_type: str
-
-class UserData(BaseModel):
-    username: str
-    role: str
-
-class UserCreate(BaseModel):
-    username: str
-    password: str
-    role: str = "regular"
-
-class PasswordChange(BaseModel):
-    old_password: str
-    new_password: str
-
-class PlaylistCreate(BaseModel):
-    url: str
-
-class PlaylistUpdate(BaseModel):
-    name: Optional[str] = None
-    is_active: Optional[bool] = None
-
-# Dependencies
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# Auth Helpers
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
-    return user
-
-def get_admin_user(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin privileges required")
-    return current_user
-
-# ============================================================================
-# EMAIL SERVICE
-# ============================================================================
-def send_daily_summary_email(db: Session):
-    """Calculates totals for today and sends an email."""
-    print("Preparing daily summary email...")
-    
-    if not SENDER_EMAIL or not SENDER_PASSWORD:
-        print("✗ Email credentials not set. Skipping email.")
-        return
-
-    # Get today's stats
-    latest_date = db.query(func.max(StreamHistory.date)).scalar()
-    
-    if not latest_date:
-        print("✗ No data found to email.")
-        return
-
-    # Aggregate Data
-    stats = db.query(
-        func.sum(StreamHistory.total_streams).label("total"),
-        func.sum(StreamHistory.daily_streams).label("daily"),
-        func.sum(StreamHistory.weekly_streams).label("weekly"),
-        func.sum(StreamHistory.monthly_streams).label("monthly"),
-        func.count(StreamHistory.id).label("tracks")
-    ).filter(StreamHistory.date == latest_date).first()
-
-    total_playlists = db.query(Playlist).filter(Playlist.is_active == True).count()
-
-    # Create Email Content
-    msg = MIMEMultipart("alternative")
-    msg['Subject'] = f"Daily Spotify Stream Update - {latest_date.strftime('%Y-%m-%d')}"
-    msg['From'] = SENDER_EMAIL
-    msg['To'] = RECIPIENT_EMAIL
-
-    html_content = f"""
-    <html>
-      <body style="font-family: Arial, sans-serif; color: #333;">
-        <h2 style="color: #1DB954;">Spotify Daily Analytics</h2>
-        <p>Here are the aggregated stats for <strong>{latest_date.strftime('%Y-%m-%d')}</strong>:</p>
-        
-        <table style="border-collapse: collapse; width: 100%; max-width: 600px;">
-          <tr style="background-color: #f2f2f2;">
-            <th style="padding: 10px; border: 1px solid #ddd; text-align: left;">Metric</th>
-            <th style="padding: 10px; border: 1px solid #ddd; text-align: right;">Value</th>
-          </tr>
-          <tr>
-            <td style="padding: 10px; border: 1px solid #ddd;">Total Streams</td>
-            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;"><strong>{stats.total:,.0f}</strong></td>
-          </tr>
-          <tr>
-            <td style="padding: 10px; border: 1px solid #ddd;">Daily Growth</td>
-            <td style="padding: 10px; border: 1px solid #ddd; text-align: right; color: #1DB954;">+{stats.daily:,.0f}</td>
-          </tr>
-          <tr>
-            <td style="padding: 10px; border: 1px solid #ddd;">Weekly Growth (7d)</td>
-            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">+{stats.weekly:,.0f}</td>
-          </tr>
-          <tr>
-            <td style="padding: 10px; border: 1px solid #ddd;">Monthly Growth (30d)</td>
-            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">+{stats.monthly:,.0f}</td>
-          </tr>
-          <tr>
-            <td style="padding: 10px; border: 1px solid #ddd;">Active Playlists</td>
-            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">{total_playlists}</td>
-          </tr>
-          <tr>
-            <td style="padding: 10px; border: 1px solid #ddd;">Tracks Tracked</td>
-            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">{stats.tracks}</td>
-          </tr>
-        </table>
-        
-        <p style="font-size: 12px; color: #777; margin-top: 20px;">
-          Sent automatically by Spotify Stream Tracker.
-        </p>
-      </body>
-    </html>
-    """
-
-    msg.attach(MIMEText(html_content, 'html'))
-
-    try:
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(SENDER_EMAIL, SENDER_PASSWORD)
-        server.sendmail(SENDER_EMAIL, RECIPIENT_EMAIL, msg.as_string())
-        server.quit()
-        print(f"✓ Email successfully sent to {RECIPIENT_EMAIL}")
-        return True
-    except Exception as e:
-        print(f"✗ Failed to send email: {e}")
-        return False
-
-# Scheduler
-scheduler = BackgroundScheduler()
-
-def run_tracker_job():
-    """Background job to update all active playlists"""
-    print(f"\n{'='*70}")
-    print(f"[{datetime.now()}] SCHEDULER: Starting daily update job")
-    print(f"{'='*70}\n")
-    
-    from core_tracker import SpotifyStreamTracker
-    
-    db = SessionLocal()
-    try:
-        playlists = db.query(Playlist).filter(Playlist.is_active == True).all()
-        
-        if not playlists:
-            print("No active playlists to update")
-            db.add(UpdateLog(
-                status="Info",
-                message="No active playlists found",
-                playlist_name="SYSTEM"
-            ))
-            db.commit()
-            return
-        
-        print(f"Found {len(playlists)} active playlist(s) to update\n")
-        
-        for idx, playlist in enumerate(playlists, 1):
-            print(f"\n[{idx}/{len(playlists)}] Processing: {playlist.name}")
-            print("-" * 60)
-            
-            try:
-                tracker = SpotifyStreamTracker(playlist.url)
-                tracker.run_and_save(db, playlist)
-                
-                db.add(UpdateLog(
-                    status="Success",
-                    message=f"Successfully updated playlist",
-                    playlist_name=playlist.name
-                ))
-                print(f"✓ {playlist.name} completed successfully")
-                
-            except Exception as e:
-                error_msg = str(e)
-                print(f"✗ Error updating {playlist.name}: {error_msg}")
-                
-                db.add(UpdateLog(
-                    status="Failure",
-                    message=f"Failed to update playlist",
-                    playlist_name=playlist.name,
-                    error_details=error_msg
-                ))
-        
-        # === EMAIL INTEGRATION ===
-        # Send email after all playlists are processed
-        try:
-            email_sent = send_daily_summary_email(db)
-            db.add(UpdateLog(
-                status="Success" if email_sent else "Warning",
-                message="Daily Email Sent" if email_sent else "Daily Email Failed",
-                playlist_name="SYSTEM"
-            ))
-        except Exception as e:
-            print(f"Critical Email Error: {e}")
-            
-        db.commit()
-        print(f"\n{'='*70}")
-        print(f"Daily update job completed at {datetime.now()}")
-        print(f"{'='*70}\n")
-        
-    except Exception as e:
-        print(f"\n✗ CRITICAL SCHEDULER ERROR: {e}")
-        db.add(UpdateLog(
-            status="Failure",
-            message=f"Scheduler error: {str(e)}",
-            playlist_name="SYSTEM"
-        ))
-        db.commit()
-    finally:
-        db.close()
-
-# FastAPI App
-app = FastAPI(
-    title="Spotify Stream Tracker",
-    description="Advanced Spotify playlist stream tracking with data analytics",
-    version="2.0"
-)
-
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Mount Static Files
-app.mount("/static", StaticFiles(directory="static"), name="static")
-
-# Startup & Shutdown
-@app.on_event("startup")
-def startup_event():
-    print("\n" + "="*70)
-    print("SPOTIFY STREAM TRACKER - Starting Up")
-    print("="*70 + "\n")
-    
-    # Create tables
-    Base.metadata.create_all(bind=engine)
-    print("✓ Database tables created/verified")
-    
-    # Create default admin
-    db = SessionLocal()
-    try:
-        if not db.query(User).filter(User.username == "admin").first():
-            admin_user = User(
-                username="admin",
-                hashed_password=get_password_hash("admin123"),
-                role="admin"
-            )
-            db.add(admin_user)
-            db.commit()
-            print("✓ Default admin created (username: admin, password: admin123)")
-        else:
-            print("✓ Admin user already exists")
-    finally:
-        db.close()
-    
-    # Start scheduler (runs daily at 3 AM)
-    scheduler.add_job(
-        run_tracker_job,
-        CronTrigger(hour=3, minute=0),
-        id='daily_update',
-        name='Daily Playlist Update',
-        replace_existing=True
-    )
-    scheduler.start()
-    print("✓ Scheduler started (Daily updates at 03:00)")
-    
-    print("\n" + "="*70)
-    print("System Ready!")
-    print("="*70 + "\n")
-
-@app.on_event("shutdown")
-def shutdown_event():
-    scheduler.shutdown()
-    print("\n✓ Scheduler stopped")
-
-# ============================================================================
-# AUTH ROUTES
-# ============================================================================
-
-@app.post("/token", response_model=Token)
-async def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), 
-    db: Session = Depends(get_db)
-):
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username}, 
-        expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
-
-@app.get("/users/me", response_model=UserData)
-async def read_users_me(current_user: User = Depends(get_current_user)):
-    return {"username": current_user.username, "role": current_user.role}
-
-# ============================================================================
-# USER MANAGEMENT (ADMIN ONLY)
-# ============================================================================
-
-@app.get("/api/users")
-async def get_all_users(
-    db: Session = Depends(get_db), 
-    admin: User = Depends(get_admin_user)
-):
-    users = db.query(User).all()
-    return [{
-        "id": u.id,
-        "username": u.username,
-        "role": u.role,
-        "created_at": u.created_at.isoformat()
-    } for u in users]
-
-@app.post("/api/users", status_code=201)
-async def create_user(
-    user_data: UserCreate,
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
-):
-    if db.query(User).filter(User.username == user_data.username).first():
-        raise HTTPException(status_code=400, detail="Username already exists")
-    
-    new_user = User(
-        username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
-        role=user_data.role
-    )
-    db.add(new_user)
-    db.commit()
-    return {"message": "User created successfully"}
-
-@app.delete("/api/users/{user_id}")
-async def delete_user(
-    user_id: int,
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
-):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if user.username == "admin":
-        raise HTTPException(status_code=400, detail="Cannot delete default admin")
-    
-    db.delete(user)
-    db.commit()
-    return {"message": "User deleted successfully"}
-
-@app.post("/api/change-password")
-async def change_password(
-    password_data: PasswordChange,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    if not verify_password(password_data.old_password, current_user.hashed_password):
-        raise HTTPException(status_code=400, detail="Incorrect old password")
-    
-    current_user.hashed_password = get_password_hash(password_data.new_password)
-    db.commit()
-    return {"message": "Password changed successfully"}
-
-# ============================================================================
-# PLAYLIST MANAGEMENT
-# ============================================================================
-
-@app.post("/api/playlists", status_code=201)
-async def add_playlist(
-    playlist: PlaylistCreate,
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
-):
-    match = re.search(r'playlist/([a-zA-Z0-9]+)', playlist.url)
-    if not match:
-        raise HTTPException(status_code=400, detail="Invalid Spotify playlist URL")
-    
-    spotify_id = match.group(1)
-    
-    if db.query(Playlist).filter(Playlist.spotify_id == spotify_id).first():
-        raise HTTPException(status_code=400, detail="Playlist already exists")
-    
-    # Fetch playlist name from API
-    try:
-        from core_tracker import SpotifyStreamTracker
-        tracker = SpotifyStreamTracker(playlist.url)
-        if tracker.setup_spotipy():
-            playlist_data = tracker.sp.playlist(spotify_id)
-            playlist_name = playlist_data['name']
-        else:
-            playlist_name = f"Playlist {spotify_id}"
-    except:
-        playlist_name = f"Playlist {spotify_id}"
-    
-    new_playlist = Playlist(
-        spotify_id=spotify_id,
-        name=playlist_name,
-        url=playlist.url
-    )
-    db.add(new_playlist)
-    db.commit()
-    return {"message": f"Playlist '{playlist_name}' added successfully"}
-
-@app.get("/api/playlists")
-async def get_playlists(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    playlists = db.query(Playlist).all()
-    return [{
-        "id": p.id,
-        "name": p.name,
-        "url": p.url,
-        "spotify_id": p.spotify_id,
-        "is_active": p.is_active,
-        "last_updated": p.last_updated.isoformat() if p.last_updated else None,
-        "track_count": len(p.tracks),
-        # NEW: Update status tracking (null-safe for old data)
-        "update_status": getattr(p, 'update_status', 'idle'),
-        "update_started_at": getattr(p, 'update_started_at', None).isoformat() if getattr(p, 'update_started_at', None) else None,
-        "update_completed_at": getattr(p, 'update_completed_at', None).isoformat() if getattr(p, 'update_completed_at', None) else None,
-        "last_successful_update": getattr(p, 'last_successful_update', None).isoformat() if getattr(p, 'last_successful_update', None) else None
-    } for p in playlists]
-
-@app.put("/api/playlists/{playlist_id}")
-async def update_playlist(
-    playlist_id: int,
-    update_data: PlaylistUpdate,
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
-):
-    playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
-    if not playlist:
-        raise HTTPException(status_code=404, detail="Playlist not found")
-    
-    if update_data.name is not None:
-        playlist.name = update_data.name
-    if update_data.is_active is not None:
-        playlist.is_active = update_data.is_active
-    
-    db.commit()
-    return {"message": "Playlist updated successfully"}
-
-@app.delete("/api/playlists/{playlist_id}")
-async def delete_playlist(
-    playlist_id: int,
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
-):
-    playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
-    if not playlist:
-        raise HTTPException(status_code=404, detail="Playlist not found")
-    
-    db.delete(playlist)
-    db.commit()
-    return {"message": "Playlist deleted successfully"}
-
-# ============================================================================
-# DATA ENDPOINTS
-# ============================================================================
-
-@app.get("/api/summary")
-async def get_summary_data(
-    playlist_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    latest_date = db.query(func.max(StreamHistory.date)).scalar()
-    if not latest_date:
-        return {"tracks": [], "playlist_totals": [], "overall_total": {}}
-    
-    query = db.query(StreamHistory).join(Track).join(Playlist).filter(
-        StreamHistory.date == latest_date
-    )
-    
-    if playlist_id:
-        query = query.filter(Playlist.id == playlist_id)
-    
-    results = query.all()
-    
-    # Track-level data
-    tracks = [{
-        "track": item.track.name,
-        "artist": item.track.artist,
-        "playlist": item.track.playlist.name,
-        "playlist_id": item.track.playlist.id,
-        "total": item.total_streams,
-        "daily": item.daily_streams,
-        "weekly": item.weekly_streams,
-        "monthly": item.monthly_streams,
-        "status": "imputed" if item.is_imputed else ("reset" if item.is_reset else ("new" if item.is_new else ("hidden" if item.is_hidden else "ok"))),
-        # NEW: Scraping metadata (null-safe for old data)
-        "is_simulated": getattr(item, 'is_simulated', False),
-        "scrape_method": getattr(item, 'scrape_method', None),
-        "confidence": getattr(item, 'confidence_score', None)
-    } for item in results]
-    
-    # Calculate playlist-wise totals
-    playlist_totals = {}
-    for item in results:
-        pid = item.track.playlist.id
-        pname = item.track.playlist.name
-        
-        if pid not in playlist_totals:
-            playlist_totals[pid] = {
-                "playlist_id": pid,
-                "playlist_name": pname,
-                "total_streams": 0,
-                "daily_streams": 0,
-                "weekly_streams": 0,
-                "monthly_streams": 0,
-                "track_count": 0
-            }
-        
-        playlist_totals[pid]["total_streams"] += item.total_streams
-        playlist_totals[pid]["daily_streams"] += item.daily_streams
-        playlist_totals[pid]["weekly_streams"] += item.weekly_streams
-        playlist_totals[pid]["monthly_streams"] += item.monthly_streams
-        playlist_totals[pid]["track_count"] += 1
-    
-    # Calculate overall total across all playlists
-    overall_total = {
-        "total_streams": sum(p["total_streams"] for p in playlist_totals.values()),
-        "daily_streams": sum(p["daily_streams"] for p in playlist_totals.values()),
-        "weekly_streams": sum(p["weekly_streams"] for p in playlist_totals.values()),
-        "monthly_streams": sum(p["monthly_streams"] for p in playlist_totals.values()),
-        "total_tracks": sum(p["track_count"] for p in playlist_totals.values()),
-        "total_playlists": len(playlist_totals)
-    }
-    
-    return {
-        "tracks": tracks,
-        "playlist_totals": list(playlist_totals.values()),
-        "overall_total": overall_total
-    }
-
-@app.get("/api/sheets_view")
-async def get_sheets_view(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Returns data organized by playlist in a sheet-like format.
-    Each playlist gets its own 'sheet' with all its tracks and totals.
-    """
-    latest_date = db.query(func.max(StreamHistory.date)).scalar()
-    if not latest_date:
-        return []
-    
-    playlists = db.query(Playlist).all()
-    sheets = []
-    
-    for playlist in playlists:
-        results = db.query(StreamHistory).join(Track).filter(
-            Track.playlist_id == playlist.id,
-            StreamHistory.date == latest_date
-        ).all()
-        
-        if not results:
-            continue
-        
-        tracks = [{
-            "track": item.track.name,
-            "artist": item.track.artist,
-            "spotify_id": item.track.spotify_id,
-            "url": item.track.url,
-            "total": item.total_streams,
-            "daily": item.daily_streams,
-            "weekly": item.weekly_streams,
-            "monthly": item.monthly_streams,
-            "status": "imputed" if item.is_imputed else ("reset" if item.is_reset else ("new" if item.is_new else ("hidden" if item.is_hidden else "ok")))
-        } for item in results]
-        
-        # Calculate totals for this playlist
-        totals = {
-            "total_streams": sum(t["total"] for t in tracks),
-            "daily_streams": sum(t["daily"] for t in tracks),
-            "weekly_streams": sum(t["weekly"] for t in tracks),
-            "monthly_streams": sum(t["monthly"] for t in tracks),
-            "track_count": len(tracks)
-        }
-        
-        sheets.append({
-            "playlist_id": playlist.id,
-            "playlist_name": playlist.name,
-            "playlist_url": playlist.url,
-            "spotify_id": playlist.spotify_id,
-            "is_active": playlist.is_active,
-            "last_updated": playlist.last_updated.isoformat() if playlist.last_updated else None,
-            "tracks": tracks,
-            "totals": totals
-        })
-    
-    return sheets
-
-@app.get("/api/full_data")
-async def get_full_data(
-    playlist_id: Optional[int] = None,
-    limit: int = 2000,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    query = db.query(StreamHistory).join(Track).join(Playlist)
-    
-    if playlist_id:
-        query = query.filter(Playlist.id == playlist_id)
-    
-    history = query.order_by(StreamHistory.date.desc()).limit(limit).all()
-    
-    return [{
-        "date": h.date.strftime("%Y-%m-%d"),
-        "track": h.track.name,
-        "artist": h.track.artist,
-        "playlist": h.track.playlist.name,
-        "streams": h.total_streams,
-        "change": h.daily_streams,
-        "weekly": h.weekly_streams,
-        "monthly": h.monthly_streams,
-        "is_imputed": h.is_imputed,
-        "is_reset": h.is_reset,
-        "is_new": h.is_new,
-        "is_hidden": h.is_hidden
-    } for h in history]
-
-@app.get("/api/track_history/{track_id}")
-async def get_track_history(
-    track_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    history = db.query(StreamHistory).filter(
-        StreamHistory.track_id == track_id
-    ).order_by(StreamHistory.date.asc()).all()
-    
-    return [{
-        "date": h.date.strftime("%Y-%m-%d"),
-        "total_streams": h.total_streams,
-        "daily_streams": h.daily_streams
-    } for h in history]
-
-@app.get("/api/stats")
-async def get_system_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    total_playlists = db.query(Playlist).count()
-    active_playlists = db.query(Playlist).filter(Playlist.is_active == True).count()
-    total_tracks = db.query(Track).count()
-    total_history = db.query(StreamHistory).count()
-    last_update = db.query(func.max(StreamHistory.date)).scalar()
-    
-    return {
-        "total_playlists": total_playlists,
-        "active_playlists": active_playlists,
-        "total_tracks": total_tracks,
-        "total_records": total_history,
-        "last_update": last_update.isoformat() if last_update else None
-    }
-
-# ============================================================================
-# ADMIN ACTIONS
-# ============================================================================
-
-@app.post("/api/force_update")
-async def force_update(
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
-):
-    scheduler.add_job(
-        run_tracker_job,
-        'date',
-        run_date=datetime.now() + timedelta(seconds=2),
-        id=f'manual_update_{int(time.time())}',
-        name='Manual Update'
-    )
-    
-    db.add(UpdateLog(
-        status="Info",
-        message="Manual update triggered by admin",
-        playlist_name="SYSTEM"
-    ))
-    db.commit()
-    
-    return {"message": "Update job triggered. Check logs for progress."}
-
-@app.get("/api/logs")
-async def get_logs(
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    logs = db.query(UpdateLog).order_by(
-        UpdateLog.timestamp.desc()
-    ).limit(limit).all()
-    
-    return [{
-        "id": log.id,
-        "timestamp": log.timestamp.isoformat(),
-        "status": log.status,
-        "message": log.message,
-        "playlist_name": log.playlist_name,
-        "error_details": log.error_details
-    } for log in logs]
-
-# ============================================================================
-# HTML PAGES
-# ============================================================================
-
-@app.get("/", response_class=HTMLResponse)
-async def read_root():
-    file_path = os.path.join("static", "login.html")
-    if not os.path.exists(file_path):
-        return HTMLResponse("<h1>login.html not found</h1>", status_code=404)
-    with open(file_path, "r", encoding="utf-8") as f:
-        return HTMLResponse(content=f.read())
-
-@app.get("/dashboard", response_class=HTMLResponse)
-async def read_dashboard():
-    file_path = os.path.join("static", "dashboard.html")
-    if not os.path.exists(file_path):
-        return HTMLResponse("<h1>dashboard.html not found</h1>", status_code=404)
-    with open(file_path, "r", encoding="utf-8") as f:
-        return HTMLResponse(content=f.read())
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+import os
+import time
+import hashlib
+import contextvars
+import secrets
+import smtplib
+from string import Template
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, date
+from typing import List, Optional
+import re
+
+import orjson
+from cachetools import TTLCache
+
+from fastapi import FastAPI, Depends, HTTPException, Response, status
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, StreamingResponse
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import case, create_engine, event, func, insert, select, text, update
+from sqlalchemy.orm import sessionmaker, Session
+from passlib.context import CryptContext
+from jose import JWTError, jwt
+from pydantic import BaseModel
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from core_tracker import SpotifyStreamTracker, get_spotify_client
+from db_models import Base, User, Playlist, Track, StreamHistory, UpdateLog
+
+# Track status resolved by the database instead of a per-row Python ternary
+TRACK_STATUS_CASE = case(
+    (StreamHistory.is_imputed, "imputed"),
+    (StreamHistory.is_reset, "reset"),
+    (StreamHistory.is_new, "new"),
+    (StreamHistory.is_hidden, "hidden"),
+    else_="ok"
+).label("status")
+
+# Configuration
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./stream_tracker.db")
+
+# Compiled once — add_playlist validates a URL on every request
+PLAYLIST_URL_RE = re.compile(r'playlist/([a-zA-Z0-9]+)')
+SECRET_KEY = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+
+# Email Configuration
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SENDER_EMAIL = os.getenv("SENDER_EMAIL", "")
+SENDER_PASSWORD = os.getenv("SENDER_PASSWORD", "")
+RECIPIENT_EMAIL = "andre@sevenstudios.se"
+
+# Database Setup
+if "sqlite" in DATABASE_URL:
+    # SQLite (local dev): single file, no batching support needed
+    engine_kwargs = {"connect_args": {"check_same_thread": False}}
+else:
+    # Postgres: emit multi-row INSERTs so persisting a StreamHistory batch
+    # is one round-trip instead of one per row, and size the pool for
+    # concurrent uvicorn workers (pre_ping/recycle guard against stale
+    # connections after DB restarts or idle timeouts)
+    engine_kwargs = {
+        "executemany_mode": "values_plus_batch",
+        "insertmanyvalues_page_size": 1000,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 20)),
+        # Generous overflow with a short timeout: a brief burst borrows
+        # extra connections instead of queueing, and a genuinely exhausted
+        # pool fails fast rather than hanging requests for 30s
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 40)),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 5)),
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+engine = create_engine(DATABASE_URL, **engine_kwargs)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Read-only sessions run in AUTOCOMMIT so GET endpoints skip the
+# BEGIN/COMMIT bookkeeping a transactional session issues per request
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
+
+# Response Cache (optional)
+# The heavy read endpoints only change once per scheduler run, so their
+# responses are cached in Redis and invalidated by run_tracker_job. When
+# REDIS_URL is unset or Redis is unreachable the endpoints just compute
+# the response as before.
+REDIS_URL = os.getenv("REDIS_URL", "")
+redis_client = None
+if REDIS_URL:
+    try:
+        import redis
+        redis_client = redis.from_url(REDIS_URL)
+        redis_client.ping()
+        print("✓ Redis response cache enabled")
+    except Exception as e:
+        redis_client = None
+        print(f"✗ Redis unavailable, response caching disabled: {e}")
+
+# Browser/CDN cache policy for the dashboard data endpoints: serve from
+# local cache for a minute, and allow a stale copy while revalidating so
+# polls never block on the origin
+API_CACHE_HEADERS = {"Cache-Control": "public, max-age=60, stale-while-revalidate=300"}
+
+def cache_get_response(key: str):
+    """Return the cached payload as a ready-to-send JSON response, or None."""
+    if redis_client is None:
+        return None
+    try:
+        cached = redis_client.get(key)
+        if cached is None:
+            return None
+        return Response(
+            content=cached,
+            media_type="application/json",
+            headers=API_CACHE_HEADERS
+        )
+    except Exception:
+        return None
+
+def cache_set(key: str, value, ttl: int = 86400):
+    if redis_client is None:
+        return
+    try:
+        redis_client.set(key, orjson.dumps(value), ex=ttl)
+    except Exception:
+        pass
+
+def cache_invalidate(*patterns: str):
+    if redis_client is None:
+        return
+    try:
+        for pattern in patterns:
+            for key in redis_client.scan_iter(pattern):
+                redis_client.delete(key)
+    except Exception:
+        pass
+
+# Security
+# bcrypt at 10 rounds (~4x faster than the default 12) keeps /token from
+# serialising through the threadpool under concurrent logins; existing
+# 12-round hashes are upgraded transparently on successful login.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=10)
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+# Pydantic Models
+class Token(BaseModel):
+    access_token: str
+    token_type: str
+
+class UserData(BaseModel):
+    username: str
+    role: str
+
+class UserCreate(BaseModel):
+    username: str
+    password: str
+    role: str = "regular"
+
+class PasswordChange(BaseModel):
+    old_password: str
+    new_password: str
+
+class PlaylistCreate(BaseModel):
+    url: str
+
+class PlaylistUpdate(BaseModel):
+    name: Optional[str] = None
+    is_active: Optional[bool] = None
+
+# Dependencies
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db():
+    """Autocommit session for endpoints that only read."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Auth Helpers
+def verify_password(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+def get_password_hash(password):
+    return pwd_context.hash(password)
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    to_encode = data.copy()
+    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
+    to_encode.update({"exp": expire})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+# Authenticated-user lookups run on every API call; a short-lived cache
+# skips the per-request DB query between dashboard polls. Entries are
+# evicted when a user is deleted or changes password.
+_user_cache = TTLCache(maxsize=1024, ttl=60)
+
+# Successful logins are remembered for 5 minutes keyed by
+# (username, sha256(password)) so a polling client re-authenticating with
+# the same credentials skips the bcrypt verify. bcrypt remains the stored
+# format; this only short-circuits repeat verifications.
+_verified_pw_cache = TTLCache(maxsize=4096, ttl=300)
+
+def _forget_verified_passwords(username: str):
+    for key in [k for k in _verified_pw_cache.keys() if k[0] == username]:
+        _verified_pw_cache.pop(key, None)
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_read_db)):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        username: str = payload.get("sub")
+        if username is None:
+            raise credentials_exception
+    except JWTError:
+        raise credentials_exception
+
+    cached_user = _user_cache.get(username)
+    if cached_user is not None:
+        return cached_user
+
+    user = db.query(User).filter(User.username == username).first()
+    if user is None:
+        raise credentials_exception
+
+    _user_cache[username] = user
+    return user
+
+def get_admin_user(current_user: User = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return current_user
+
+# ============================================================================
+# EMAIL SERVICE
+# ============================================================================
+
+# Compiled once at import; send_daily_summary_email only substitutes the
+# per-day values instead of rebuilding the whole HTML string each run.
+_EMAIL_TEMPLATE = Template("""
+    <html>
+      <body style="font-family: Arial, sans-serif; color: #333;">
+        <h2 style="color: #1DB954;">Spotify Daily Analytics</h2>
+        <p>Here are the aggregated stats for <strong>$date</strong>:</p>
+
+        <table style="border-collapse: collapse; width: 100%; max-width: 600px;">
+          <tr style="background-color: #f2f2f2;">
+            <th style="padding: 10px; border: 1px solid #ddd; text-align: left;">Metric</th>
+            <th style="padding: 10px; border: 1px solid #ddd; text-align: right;">Value</th>
+          </tr>
+          <tr>
+            <td style="padding: 10px; border: 1px solid #ddd;">Total Streams</td>
+            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;"><strong>$total</strong></td>
+          </tr>
+          <tr>
+            <td style="padding: 10px; border: 1px solid #ddd;">Daily Growth</td>
+            <td style="padding: 10px; border: 1px solid #ddd; text-align: right; color: #1DB954;">+$daily</td>
+          </tr>
+          <tr>
+            <td style="padding: 10px; border: 1px solid #ddd;">Weekly Growth (7d)</td>
+            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">+$weekly</td>
+          </tr>
+          <tr>
+            <td style="padding: 10px; border: 1px solid #ddd;">Monthly Growth (30d)</td>
+            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">+$monthly</td>
+          </tr>
+          <tr>
+            <td style="padding: 10px; border: 1px solid #ddd;">Active Playlists</td>
+            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">$playlists</td>
+          </tr>
+          <tr>
+            <td style="padding: 10px; border: 1px solid #ddd;">Tracks Tracked</td>
+            <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">$tracks</td>
+          </tr>
+        </table>
+
+        <p style="font-size: 12px; color: #777; margin-top: 20px;">
+          Sent automatically by Spotify Stream Tracker.
+        </p>
+      </body>
+    </html>
+""")
+
+def send_daily_summary_email(db: Session):
+    """Calculates totals for today and sends an email."""
+    print("Preparing daily summary email...")
+    
+    if not SENDER_EMAIL or not SENDER_PASSWORD:
+        print("✗ Email credentials not set. Skipping email.")
+        return
+
+    # Get today's stats
+    latest_date = db.query(func.max(StreamHistory.date)).scalar()
+    
+    if not latest_date:
+        print("✗ No data found to email.")
+        return
+
+    # Aggregate Data (active playlist count folded in as a scalar subquery
+    # so this is a single round-trip instead of two)
+    active_playlists_sq = db.query(func.count(Playlist.id)).filter(
+        Playlist.is_active == True
+    ).scalar_subquery()
+
+    stats = db.query(
+        func.sum(StreamHistory.total_streams).label("total"),
+        func.sum(StreamHistory.daily_streams).label("daily"),
+        func.sum(StreamHistory.weekly_streams).label("weekly"),
+        func.sum(StreamHistory.monthly_streams).label("monthly"),
+        func.count(StreamHistory.id).label("tracks"),
+        active_playlists_sq.label("playlists")
+    ).filter(StreamHistory.date == latest_date).first()
+
+    total_playlists = stats.playlists
+
+    # Create Email Content
+    msg = MIMEMultipart("alternative")
+    msg['Subject'] = f"Daily Spotify Stream Update - {latest_date.strftime('%Y-%m-%d')}"
+    msg['From'] = SENDER_EMAIL
+    msg['To'] = RECIPIENT_EMAIL
+
+    html_content = _EMAIL_TEMPLATE.substitute(
+        date=latest_date.strftime('%Y-%m-%d'),
+        total=f"{stats.total:,.0f}",
+        daily=f"{stats.daily:,.0f}",
+        weekly=f"{stats.weekly:,.0f}",
+        monthly=f"{stats.monthly:,.0f}",
+        playlists=total_playlists,
+        tracks=stats.tracks
+    )
+
+    msg.attach(MIMEText(html_content, 'html'))
+
+    try:
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+        server.starttls()
+        server.login(SENDER_EMAIL, SENDER_PASSWORD)
+        server.sendmail(SENDER_EMAIL, RECIPIENT_EMAIL, msg.as_string())
+        server.quit()
+        print(f"✓ Email successfully sent to {RECIPIENT_EMAIL}")
+        return True
+    except Exception as e:
+        print(f"✗ Failed to send email: {e}")
+        return False
+
+# ============================================================================
+# LATEST-STREAM MATERIALIZED VIEW (Postgres only)
+# ============================================================================
+# Keeps the newest StreamHistory row per track precomputed so read paths on
+# Postgres deployments can join against it instead of re-running the
+# MAX(date)-per-track aggregate. SQLite (local dev) has no materialized
+# views, so both helpers are no-ops there.
+
+def create_latest_stream_view():
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE MATERIALIZED VIEW IF NOT EXISTS latest_stream AS
+            SELECT DISTINCT ON (track_id) *
+            FROM stream_history
+            ORDER BY track_id, date DESC
+        """))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_latest_stream_track "
+            "ON latest_stream (track_id)"
+        ))
+
+def create_playlist_totals_view():
+    # Per-playlist/day aggregates precomputed once per scheduler run; the
+    # unique index is what REFRESH CONCURRENTLY requires
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE MATERIALIZED VIEW IF NOT EXISTS mv_playlist_daily_totals AS
+            SELECT p.id AS playlist_id,
+                   p.name,
+                   sh.date,
+                   sh.is_simulated,
+                   sum(sh.total_streams) AS total_streams,
+                   sum(sh.daily_streams) AS daily_streams,
+                   sum(sh.weekly_streams) AS weekly_streams,
+                   sum(sh.monthly_streams) AS monthly_streams,
+                   count(*) AS track_count
+            FROM playlists p
+            JOIN tracks t ON t.playlist_id = p.id
+            JOIN stream_history sh ON sh.track_id = t.id
+            GROUP BY p.id, p.name, sh.date, sh.is_simulated
+        """))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_mv_playlist_daily_totals "
+            "ON mv_playlist_daily_totals (playlist_id, date, is_simulated)"
+        ))
+
+def refresh_materialized_views():
+    if engine.dialect.name != "postgresql":
+        return
+    # CONCURRENTLY (so dashboard reads are not blocked) is refused inside a
+    # transaction block, so refresh on a dedicated AUTOCOMMIT connection
+    # rather than the job's transactional session
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY latest_stream"))
+        conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_playlist_daily_totals"))
+
+# Scheduler
+scheduler = BackgroundScheduler()
+
+def _process_playlist(playlist_id: int, playlist_name: str):
+    """Update a single playlist in its own DB session (worker thread)."""
+    db = SessionLocal()
+    try:
+        playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
+        if playlist is None:
+            raise Exception("Playlist disappeared before update")
+
+        tracker = SpotifyStreamTracker(playlist.url)
+        tracker.run_and_save(db, playlist)
+
+        return {
+            "status": "Success",
+            "message": "Successfully updated playlist",
+            "playlist_name": playlist_name
+        }
+    except Exception as e:
+        return {
+            "status": "Failure",
+            "message": "Failed to update playlist",
+            "playlist_name": playlist_name,
+            "error_details": str(e)
+        }
+    finally:
+        db.close()
+
+def run_tracker_job():
+    """Background job to update all active playlists"""
+    print(f"\n{'='*70}")
+    print(f"[{datetime.now()}] SCHEDULER: Starting daily update job")
+    print(f"{'='*70}\n")
+
+    db = SessionLocal()
+    try:
+        playlists = db.query(Playlist).filter(Playlist.is_active == True).all()
+        
+        if not playlists:
+            print("No active playlists to update")
+            db.add(UpdateLog(
+                status="Info",
+                message="No active playlists found",
+                playlist_name="SYSTEM"
+            ))
+            db.commit()
+            return
+        
+        print(f"Found {len(playlists)} active playlist(s) to update\n")
+
+        # Playlists are scraped in parallel — wall time becomes the slowest
+        # playlist rather than the sum. Each worker gets its own session
+        # since SQLAlchemy sessions are not thread-safe.
+        max_workers = min(int(os.getenv("TRACKER_MAX_WORKERS", 8)), len(playlists))
+
+        # Accumulate per-playlist outcomes and write them in one batch at
+        # the end instead of a flush/commit per playlist
+        update_logs = []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_process_playlist, p.id, p.name): p.name
+                for p in playlists
+            }
+            for future in as_completed(futures):
+                log = future.result()
+                update_logs.append(log)
+
+                if log["status"] == "Success":
+                    print(f"✓ {log['playlist_name']} completed successfully")
+                else:
+                    print(f"✗ Error updating {log['playlist_name']}: {log.get('error_details')}")
+
+        # === EMAIL INTEGRATION ===
+        # Send email after all playlists are processed
+        try:
+            email_sent = send_daily_summary_email(db)
+            update_logs.append({
+                "status": "Success" if email_sent else "Warning",
+                "message": "Daily Email Sent" if email_sent else "Daily Email Failed",
+                "playlist_name": "SYSTEM"
+            })
+        except Exception as e:
+            print(f"Critical Email Error: {e}")
+
+        # Core executemany: all log rows go out as one batched INSERT
+        if update_logs:
+            db.execute(insert(UpdateLog), update_logs)
+        db.commit()
+
+        # Invalidate before the MV refresh so dashboards never keep serving
+        # pre-run data if the refresh fails; the refresh itself must not
+        # take the whole job down with it
+        cache_invalidate("summary:*", "sheets", "stats")
+        try:
+            refresh_materialized_views()
+        except Exception as e:
+            print(f"✗ Materialized view refresh failed: {e}")
+        print(f"\n{'='*70}")
+        print(f"Daily update job completed at {datetime.now()}")
+        print(f"{'='*70}\n")
+        
+    except Exception as e:
+        print(f"\n✗ CRITICAL SCHEDULER ERROR: {e}")
+        db.add(UpdateLog(
+            status="Failure",
+            message=f"Scheduler error: {str(e)}",
+            playlist_name="SYSTEM"
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+# FastAPI App
+app = FastAPI(
+    title="Spotify Stream Tracker",
+    description="Advanced Spotify playlist stream tracking with data analytics",
+    version="2.0",
+    default_response_class=ORJSONResponse
+)
+
+# CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Query-count instrumentation
+# Every response carries X-Query-Count so an N+1 regression shows up as a
+# header jump (and can be asserted on in CI) instead of a slow production
+# endpoint. The counter is a one-element list inside a ContextVar: sync
+# endpoints run in the threadpool with a *copy* of the request context,
+# but the copy still references the same list, so increments made on the
+# worker thread are visible to the middleware.
+_query_count = contextvars.ContextVar("query_count", default=None)
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    holder = _query_count.get()
+    if holder is not None:
+        holder[0] += 1
+
+# Listening on the base engine covers the derived AUTOCOMMIT read engine
+# too — OptionEngines inherit the parent's event listeners, so a second
+# registration would double-count every read query. Note the streaming
+# endpoints report 0: their queries run during body iteration, after the
+# header is stamped.
+event.listen(engine, "before_cursor_execute", _count_query)
+
+@app.middleware("http")
+async def count_queries_middleware(request, call_next):
+    token = _query_count.set([0])
+    try:
+        response = await call_next(request)
+        count = _query_count.get()[0]
+        response.headers["X-Query-Count"] = str(count)
+        if count > 10:
+            print(f"✗ {request.url.path}: {count} queries in one request (possible N+1)")
+        return response
+    finally:
+        _query_count.reset(token)
+
+# Mount Static Files
+app.mount("/static", StaticFiles(directory="static"), name="static")
+
+# Startup & Shutdown
+@app.on_event("startup")
+def startup_event():
+    print("\n" + "="*70)
+    print("SPOTIFY STREAM TRACKER - Starting Up")
+    print("="*70 + "\n")
+    
+    # Create tables
+    Base.metadata.create_all(bind=engine)
+    create_latest_stream_view()
+    create_playlist_totals_view()
+    print("✓ Database tables created/verified")
+
+    # Warm the pool so the first burst of requests after boot doesn't pay
+    # the TCP/SSL/auth cost; connections are held open together so each
+    # checkout really opens a fresh one
+    if "sqlite" not in DATABASE_URL:
+        warm_conns = [engine.connect() for _ in range(engine.pool.size())]
+        for conn in warm_conns:
+            conn.execute(text("SELECT 1"))
+        for conn in warm_conns:
+            conn.close()
+        print(f"✓ Connection pool warmed ({len(warm_conns)} connections)")
+    
+    # Create default admin
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.username == "admin").first():
+            admin_user = User(
+                username="admin",
+                hashed_password=get_password_hash("admin123"),
+                role="admin"
+            )
+            db.add(admin_user)
+            db.commit()
+            print("✓ Default admin created (username: admin, password: admin123)")
+        else:
+            print("✓ Admin user already exists")
+    finally:
+        db.close()
+    
+    # Start scheduler (runs daily at 3 AM)
+    scheduler.add_job(
+        run_tracker_job,
+        CronTrigger(hour=3, minute=0),
+        id='daily_update',
+        name='Daily Playlist Update',
+        replace_existing=True
+    )
+    scheduler.start()
+    print("✓ Scheduler started (Daily updates at 03:00)")
+    
+    print("\n" + "="*70)
+    print("System Ready!")
+    print("="*70 + "\n")
+
+@app.on_event("shutdown")
+def shutdown_event():
+    scheduler.shutdown()
+    print("\n✓ Scheduler stopped")
+
+# ============================================================================
+# AUTH ROUTES
+# ============================================================================
+
+@app.post("/token", response_model=Token)
+def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(), 
+    db: Session = Depends(get_db)
+):
+    user = db.query(User).filter(User.username == form_data.username).first()
+    pw_key = (form_data.username, hashlib.sha256(form_data.password.encode()).digest())
+
+    pw_ok = user is not None and (
+        _verified_pw_cache.get(pw_key)
+        or verify_password(form_data.password, user.hashed_password)
+    )
+    if not pw_ok:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    _verified_pw_cache[pw_key] = True
+
+    # Rehash passwords stored at an older (slower) bcrypt cost
+    if pwd_context.needs_update(user.hashed_password):
+        user.hashed_password = get_password_hash(form_data.password)
+        db.commit()
+
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.username}, 
+        expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@app.get("/users/me", response_model=UserData)
+def read_users_me(current_user: User = Depends(get_current_user)):
+    return {"username": current_user.username, "role": current_user.role}
+
+# ============================================================================
+# USER MANAGEMENT (ADMIN ONLY)
+# ============================================================================
+
+@app.get("/api/users")
+def get_all_users(
+    db: Session = Depends(get_read_db),
+    admin: User = Depends(get_admin_user)
+):
+    # Core SELECT of plain columns — no ORM instance construction for rows
+    # that are immediately turned into JSON
+    users = db.execute(
+        select(User.id, User.username, User.role, User.created_at)
+    ).mappings().all()
+
+    return ORJSONResponse([dict(u) for u in users])
+
+@app.post("/api/users", status_code=201)
+def create_user(
+    user_data: UserCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    if db.query(User).filter(User.username == user_data.username).first():
+        raise HTTPException(status_code=400, detail="Username already exists")
+    
+    new_user = User(
+        username=user_data.username,
+        hashed_password=get_password_hash(user_data.password),
+        role=user_data.role
+    )
+    db.add(new_user)
+    db.commit()
+    return {"message": "User created successfully"}
+
+@app.delete("/api/users/{user_id}")
+def delete_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if user.username == "admin":
+        raise HTTPException(status_code=400, detail="Cannot delete default admin")
+    
+    username = user.username
+    db.delete(user)
+    db.commit()
+    _user_cache.pop(username, None)
+    _forget_verified_passwords(username)
+    return {"message": "User deleted successfully"}
+
+@app.post("/api/change-password")
+def change_password(
+    password_data: PasswordChange,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if not verify_password(password_data.old_password, current_user.hashed_password):
+        raise HTTPException(status_code=400, detail="Incorrect old password")
+
+    # current_user belongs to the read-only session; apply the change
+    # through the transactional one
+    user = db.query(User).filter(User.id == current_user.id).first()
+    user.hashed_password = get_password_hash(password_data.new_password)
+    db.commit()
+    _user_cache.pop(current_user.username, None)
+    _forget_verified_passwords(current_user.username)
+    return {"message": "Password changed successfully"}
+
+# ============================================================================
+# PLAYLIST MANAGEMENT
+# ============================================================================
+
+@app.post("/api/playlists", status_code=201)
+def add_playlist(
+    playlist: PlaylistCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    match = PLAYLIST_URL_RE.search(playlist.url)
+    if not match:
+        raise HTTPException(status_code=400, detail="Invalid Spotify playlist URL")
+    
+    spotify_id = match.group(1)
+    
+    if db.query(Playlist).filter(Playlist.spotify_id == spotify_id).first():
+        raise HTTPException(status_code=400, detail="Playlist already exists")
+    
+    # Fetch playlist name from API — the shared client amortises auth
+    # across admin operations, and fields='name' keeps the response tiny
+    try:
+        playlist_data = get_spotify_client().playlist(spotify_id, fields='name')
+        playlist_name = playlist_data['name']
+    except:
+        playlist_name = f"Playlist {spotify_id}"
+    
+    new_playlist = Playlist(
+        spotify_id=spotify_id,
+        name=playlist_name,
+        url=playlist.url
+    )
+    db.add(new_playlist)
+    db.commit()
+    cache_invalidate("stats")
+    return {"message": f"Playlist '{playlist_name}' added successfully"}
+
+@app.get("/api/playlists")
+def get_playlists(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Core column select — the DB counts tracks per playlist via a
+    # correlated subquery, and no ORM instances (or their track
+    # collections) are built just to be flattened into dicts
+    track_count_sq = select(func.count()).where(
+        Track.playlist_id == Playlist.id
+    ).correlate(Playlist).scalar_subquery()
+
+    rows = db.execute(
+        select(
+            Playlist.id,
+            Playlist.name,
+            Playlist.url,
+            Playlist.spotify_id,
+            Playlist.is_active,
+            Playlist.last_updated,
+            track_count_sq.label("track_count")
+        )
+    ).mappings()
+
+    # orjson renders last_updated as ISO-8601 (or null) natively — no
+    # per-row isoformat()/None branch in Python
+    return ORJSONResponse([{
+        **row,
+        # Update status tracking is not in the schema yet; keep the
+        # contract's default values
+        "update_status": "idle",
+        "update_started_at": None,
+        "update_completed_at": None,
+        "last_successful_update": None
+    } for row in rows])
+
+@app.put("/api/playlists/{playlist_id}")
+def update_playlist(
+    playlist_id: int,
+    update_data: PlaylistUpdate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    # One UPDATE ... RETURNING round-trip instead of fetch-mutate-commit;
+    # exclude_unset covers the old per-field None checks
+    values = {
+        k: v for k, v in update_data.model_dump(exclude_unset=True).items()
+        if v is not None
+    }
+    if not values:
+        return {"message": "Playlist updated successfully"}
+
+    row = db.execute(
+        update(Playlist)
+        .where(Playlist.id == playlist_id)
+        .values(**values)
+        .returning(Playlist.id)
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Playlist not found")
+
+    db.commit()
+    # Summary embeds the playlist name (tracks[].playlist and
+    # playlist_totals[].playlist_name), so renames must drop it too
+    cache_invalidate("summary:*", "stats", "sheets")
+    return {"message": "Playlist updated successfully"}
+
+@app.delete("/api/playlists/{playlist_id}")
+def delete_playlist(
+    playlist_id: int,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    playlist = db.query(Playlist).filter(Playlist.id == playlist_id).first()
+    if not playlist:
+        raise HTTPException(status_code=404, detail="Playlist not found")
+    
+    db.delete(playlist)
+    db.commit()
+    cache_invalidate("summary:*", "sheets", "stats")
+    return {"message": "Playlist deleted successfully"}
+
+# ============================================================================
+# DATA ENDPOINTS
+# ============================================================================
+
+@app.get("/api/summary")
+def get_summary_data(
+    playlist_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    cache_key = f"summary:{playlist_id}"
+    cached = cache_get_response(cache_key)
+    if cached is not None:
+        return cached
+
+    # Latest date folded into the statements as a scalar subquery — saves
+    # the separate MAX(date) round-trip on every call
+    latest_sq = select(func.max(StreamHistory.date)).scalar_subquery()
+
+    # Core SELECT with the status resolved in SQL — one round-trip, no ORM
+    # instance construction and no per-row Python branching
+    tracks_query = select(
+        Track.name.label("track"),
+        Track.artist.label("artist"),
+        Playlist.name.label("playlist"),
+        Playlist.id.label("playlist_id"),
+        StreamHistory.total_streams.label("total"),
+        StreamHistory.daily_streams.label("daily"),
+        StreamHistory.weekly_streams.label("weekly"),
+        StreamHistory.monthly_streams.label("monthly"),
+        # coalesce handles rows written before the column existed, so the
+        # per-row getattr-with-default chain is gone
+        func.coalesce(StreamHistory.is_simulated, False).label("is_simulated"),
+        StreamHistory.scrape_method.label("scrape_method"),
+        StreamHistory.confidence_score.label("confidence"),
+        TRACK_STATUS_CASE
+    ).select_from(StreamHistory).join(
+        Track, StreamHistory.track_id == Track.id
+    ).join(
+        Playlist, Track.playlist_id == Playlist.id
+    ).where(StreamHistory.date == latest_sq)
+
+    if playlist_id:
+        tracks_query = tracks_query.where(Playlist.id == playlist_id)
+
+    tracks = [dict(row) for row in db.execute(tracks_query).mappings()]
+
+    if not tracks:
+        return ORJSONResponse({"tracks": [], "playlist_totals": [], "overall_total": {}})
+    
+    # Playlist-wise totals via SQL GROUP BY — one row per playlist, with
+    # the simulated split computed by SUM(CASE ...) in the same table pass
+    # instead of extra group rows folded in Python
+    sim_streams = func.sum(
+        case((StreamHistory.is_simulated, StreamHistory.total_streams), else_=0)
+    ).label("simulated_streams")
+    sim_tracks = func.sum(
+        case((StreamHistory.is_simulated, 1), else_=0)
+    ).label("simulated_tracks")
+
+    totals_query = db.query(
+        Playlist.id,
+        Playlist.name,
+        func.sum(StreamHistory.total_streams).label("total_streams"),
+        func.sum(StreamHistory.daily_streams).label("daily_streams"),
+        func.sum(StreamHistory.weekly_streams).label("weekly_streams"),
+        func.sum(StreamHistory.monthly_streams).label("monthly_streams"),
+        sim_streams,
+        sim_tracks,
+        func.count(StreamHistory.id).label("track_count")
+    ).join(
+        Track, Track.playlist_id == Playlist.id
+    ).join(
+        StreamHistory, StreamHistory.track_id == Track.id
+    ).filter(StreamHistory.date == latest_sq)
+
+    if playlist_id:
+        totals_query = totals_query.filter(Playlist.id == playlist_id)
+
+    totals_rows = totals_query.group_by(Playlist.id, Playlist.name).all()
+
+    playlist_totals = [{
+        "playlist_id": row.id,
+        "playlist_name": row.name,
+        "total_streams": row.total_streams,
+        "daily_streams": row.daily_streams,
+        "weekly_streams": row.weekly_streams,
+        "monthly_streams": row.monthly_streams,
+        "simulated_streams": row.simulated_streams,
+        "simulated_tracks": row.simulated_tracks,
+        "track_count": row.track_count
+    } for row in totals_rows]
+
+    # Overall total folds the handful of playlist rows, not every track
+    overall_total = {
+        "total_streams": sum(p["total_streams"] for p in playlist_totals),
+        "daily_streams": sum(p["daily_streams"] for p in playlist_totals),
+        "weekly_streams": sum(p["weekly_streams"] for p in playlist_totals),
+        "monthly_streams": sum(p["monthly_streams"] for p in playlist_totals),
+        "total_tracks": sum(p["track_count"] for p in playlist_totals),
+        "total_playlists": len(playlist_totals)
+    }
+
+    response = {
+        "tracks": tracks,
+        "playlist_totals": playlist_totals,
+        "overall_total": overall_total
+    }
+    cache_set(cache_key, response)
+    return ORJSONResponse(response, headers=API_CACHE_HEADERS)
+
+@app.get("/api/sheets_view")
+def get_sheets_view(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Returns data organized by playlist in a sheet-like format.
+    Each playlist gets its own 'sheet' with all its tracks and totals.
+    """
+    cached = cache_get_response("sheets")
+    if cached is not None:
+        return cached
+
+    latest_sq = select(func.max(StreamHistory.date)).scalar_subquery()
+
+    # One query for every playlist's rows instead of one query per playlist;
+    # totals are accumulated in the same pass and status comes from SQL
+    results = db.execute(
+        select(
+            Track.playlist_id.label("playlist_id"),
+            Track.name.label("track"),
+            Track.artist.label("artist"),
+            Track.spotify_id.label("spotify_id"),
+            Track.url.label("url"),
+            StreamHistory.total_streams.label("total"),
+            StreamHistory.daily_streams.label("daily"),
+            StreamHistory.weekly_streams.label("weekly"),
+            StreamHistory.monthly_streams.label("monthly"),
+            TRACK_STATUS_CASE
+        ).select_from(StreamHistory).join(
+            Track, StreamHistory.track_id == Track.id
+        ).where(StreamHistory.date == latest_sq)
+    ).mappings()
+
+    buckets = defaultdict(list)
+    totals = defaultdict(lambda: {
+        "total_streams": 0,
+        "daily_streams": 0,
+        "weekly_streams": 0,
+        "monthly_streams": 0,
+        "track_count": 0
+    })
+
+    for row in results:
+        pid = row["playlist_id"]
+        track = dict(row)
+        del track["playlist_id"]
+        buckets[pid].append(track)
+
+        t = totals[pid]
+        t["total_streams"] += row["total"]
+        t["daily_streams"] += row["daily"]
+        t["weekly_streams"] += row["weekly"]
+        t["monthly_streams"] += row["monthly"]
+        t["track_count"] += 1
+
+    sheets = []
+    for playlist in db.query(Playlist).all():
+        if playlist.id not in buckets:
+            continue
+
+        sheets.append({
+            "playlist_id": playlist.id,
+            "playlist_name": playlist.name,
+            "playlist_url": playlist.url,
+            "spotify_id": playlist.spotify_id,
+            "is_active": playlist.is_active,
+            "last_updated": playlist.last_updated,
+            "tracks": buckets[playlist.id],
+            "totals": totals[playlist.id]
+        })
+
+    cache_set("sheets", sheets)
+    return ORJSONResponse(sheets, headers=API_CACHE_HEADERS)
+
+@app.get("/api/full_data")
+def get_full_data(
+    playlist_id: Optional[int] = None,
+    limit: int = 2000,
+    # Transactional session, not get_read_db: stream_results needs a named
+    # server-side cursor on Postgres, which is refused at AUTOCOMMIT
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    stmt = select(
+        StreamHistory.date.label("date"),
+        Track.name.label("track"),
+        Track.artist.label("artist"),
+        Playlist.name.label("playlist"),
+        StreamHistory.total_streams.label("streams"),
+        StreamHistory.daily_streams.label("change"),
+        StreamHistory.weekly_streams.label("weekly"),
+        StreamHistory.monthly_streams.label("monthly"),
+        StreamHistory.is_imputed,
+        StreamHistory.is_reset,
+        StreamHistory.is_new,
+        StreamHistory.is_hidden
+    ).select_from(StreamHistory).join(
+        Track, StreamHistory.track_id == Track.id
+    ).join(
+        Playlist, Track.playlist_id == Playlist.id
+    )
+
+    if playlist_id:
+        stmt = stmt.where(Playlist.id == playlist_id)
+
+    stmt = stmt.order_by(StreamHistory.date.desc()).limit(limit)
+
+    # Stream the JSON array row-by-row instead of materializing the whole
+    # payload (up to `limit` dicts) before the first byte goes out.
+    # stream_results keeps the driver on a server-side cursor so the DB
+    # pages rows in step with the client.
+    def iter_history():
+        yield b"["
+        first = True
+        result = db.execute(
+            stmt.execution_options(stream_results=True, yield_per=500)
+        )
+        for row in result.mappings():
+            yield (b"" if first else b",") + orjson.dumps(dict(row))
+            first = False
+        yield b"]"
+
+    return StreamingResponse(iter_history(), media_type="application/json")
+
+@app.get("/api/track_history/{track_id}")
+def get_track_history(
+    track_id: int,
+    # get_db for the same reason as /api/full_data: server-side cursors
+    # need a transaction block
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    stmt = select(
+        StreamHistory.date,
+        StreamHistory.total_streams,
+        StreamHistory.daily_streams
+    ).where(
+        StreamHistory.track_id == track_id
+    ).order_by(StreamHistory.date.asc())
+
+    # Same incremental streaming as /api/full_data: a long-running track
+    # accumulates one row per day, so emit them as they arrive instead of
+    # building the full list first. orjson emits dates as ISO-8601 natively.
+    def iter_track_history():
+        yield b"["
+        first = True
+        result = db.execute(
+            stmt.execution_options(stream_results=True, yield_per=500)
+        )
+        for row in result.mappings():
+            yield (b"" if first else b",") + orjson.dumps(dict(row))
+            first = False
+        yield b"]"
+
+    return StreamingResponse(iter_track_history(), media_type="application/json")
+
+@app.get("/api/stats")
+def get_system_stats(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    cached = cache_get_response("stats")
+    if cached is not None:
+        return cached
+
+    # Five scalar subqueries in one SELECT — a single round-trip instead of
+    # five separate COUNT/MAX queries
+    stats = db.execute(
+        select(
+            select(func.count()).select_from(Playlist).scalar_subquery().label("total_playlists"),
+            select(func.count()).select_from(Playlist).where(Playlist.is_active == True).scalar_subquery().label("active_playlists"),
+            select(func.count()).select_from(Track).scalar_subquery().label("total_tracks"),
+            select(func.count()).select_from(StreamHistory).scalar_subquery().label("total_records"),
+            select(func.max(StreamHistory.date)).scalar_subquery().label("last_update")
+        )
+    ).one()
+
+    response = {
+        "total_playlists": stats.total_playlists,
+        "active_playlists": stats.active_playlists,
+        "total_tracks": stats.total_tracks,
+        "total_records": stats.total_records,
+        "last_update": stats.last_update
+    }
+    cache_set("stats", response)
+    return ORJSONResponse(response, headers=API_CACHE_HEADERS)
+
+# ============================================================================
+# ADMIN ACTIONS
+# ============================================================================
+
+@app.post("/api/force_update")
+def force_update(
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    scheduler.add_job(
+        run_tracker_job,
+        'date',
+        run_date=datetime.now() + timedelta(seconds=2),
+        id=f'manual_update_{int(time.time())}',
+        name='Manual Update'
+    )
+    
+    db.add(UpdateLog(
+        status="Info",
+        message="Manual update triggered by admin",
+        playlist_name="SYSTEM"
+    ))
+    db.commit()
+    
+    return {"message": "Update job triggered. Check logs for progress."}
+
+@app.get("/api/logs")
+def get_logs(
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    logs = db.execute(
+        select(
+            UpdateLog.id,
+            UpdateLog.timestamp,
+            UpdateLog.status,
+            UpdateLog.message,
+            UpdateLog.playlist_name,
+            UpdateLog.error_details
+        ).order_by(UpdateLog.timestamp.desc()).limit(limit)
+    ).mappings().all()
+
+    # orjson serializes the timestamp to ISO-8601 without a Python-side
+    # isoformat() per row
+    return ORJSONResponse([dict(log) for log in logs])
+
+# ============================================================================
+# HTML PAGES
+# ============================================================================
+
+# FileResponse sends the HTML shells over the kernel sendfile path (no
+# usermode copy) and carries ETag/Last-Modified so browsers revalidate
+# with cheap 304s after the short cache window
+def _serve_static_html(filename: str):
+    file_path = os.path.join("static", filename)
+    if not os.path.exists(file_path):
+        return HTMLResponse(f"<h1>{filename} not found</h1>", status_code=404)
+    return FileResponse(
+        file_path,
+        media_type="text/html",
+        headers={"Cache-Control": "public, max-age=300"}
+    )
+
+@app.get("/", response_class=HTMLResponse)
+def read_root():
+    return _serve_static_html("login.html")
+
+@app.get("/dashboard", response_class=HTMLResponse)
+def read_dashboard():
+    return _serve_static_html("dashboard.html")
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,84 @@
+"""
+One-shot schema migration for existing databases.
+
+Brings an older stream_tracker database up to the current db_models.py
+schema (scrape metadata columns + composite indexes). All statements run
+in a single transaction — one commit/fsync instead of one per ALTER —
+and on Postgres an advisory lock stops two deploys from racing the DDL.
+
+Run manually after pulling a schema change:
+    python migrate_db.py
+"""
+import os
+
+from sqlalchemy import create_engine, inspect, text
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./stream_tracker.db")
+
+# Scrape metadata columns added to stream_history
+NEW_COLUMNS = [
+    ("is_simulated", "BOOLEAN DEFAULT FALSE"),
+    ("scrape_method", "VARCHAR"),
+    ("confidence_score", "FLOAT"),
+]
+
+# Composite indexes for the dashboard and track-history access paths
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_stream_history_track_date ON stream_history (track_id, date)",
+    "CREATE INDEX IF NOT EXISTS ix_tracks_playlist_id ON tracks (playlist_id)",
+]
+
+
+def build_statements(engine):
+    is_postgres = engine.dialect.name == "postgresql"
+    statements = []
+
+    if is_postgres:
+        # Postgres knows ADD COLUMN IF NOT EXISTS, so re-runs are no-ops
+        for name, ddl in NEW_COLUMNS:
+            statements.append(
+                f"ALTER TABLE stream_history ADD COLUMN IF NOT EXISTS {name} {ddl}"
+            )
+        # Covering index: the INCLUDE columns enable index-only scans for
+        # the summary/sheets aggregates
+        statements.append(
+            "CREATE INDEX IF NOT EXISTS ix_stream_history_date_track ON stream_history "
+            "(date, track_id) INCLUDE (total_streams, daily_streams, weekly_streams, "
+            "monthly_streams, is_simulated)"
+        )
+    else:
+        # SQLite lacks IF NOT EXISTS on ADD COLUMN — inspect first
+        existing = {c["name"] for c in inspect(engine).get_columns("stream_history")}
+        for name, ddl in NEW_COLUMNS:
+            if name not in existing:
+                statements.append(
+                    f"ALTER TABLE stream_history ADD COLUMN {name} {ddl}"
+                )
+        statements.append(
+            "CREATE INDEX IF NOT EXISTS ix_stream_history_date_track "
+            "ON stream_history (date, track_id)"
+        )
+
+    statements += INDEXES
+    return statements
+
+
+def migrate():
+    engine = create_engine(DATABASE_URL)
+    statements = build_statements(engine)
+
+    # engine.begin() commits once at block exit; the advisory lock is held
+    # for the transaction so concurrent deploys queue instead of colliding
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(42)"))
+
+        for statement in statements:
+            conn.execute(text(statement))
+            print(f"✓ {statement[:70]}")
+
+    print("\n✓ Migration complete")
+
+
+if __name__ == "__main__":
+    migrate()